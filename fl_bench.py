@@ -0,0 +1,169 @@
+import sys
+import glob
+import json
+import time
+
+from flmap import CFlMap, EEngine
+
+USAGE = ("Usage:\n"
+         "  python3 fl_bench.py throughput <config_file> "
+         "[--drones=<n>] [--max-workers=<n>] [--batch=<n>] "
+         "[--simplify] [--plot=<file>]\n"
+         "  python3 fl_bench.py sweep <config_file> "
+         "[--drones=<n>] [--json] [--simplify] [--plot=<file>]\n"
+         "  python3 fl_bench.py engines [<config_file> ...] "
+         "[--drones=<n>]")
+
+
+def throughput(map: CFlMap, max_workers: int,
+               batch: int) -> list[tuple[int, int, float, int]]:
+    """ Plan all drones with 1, 2, 4 ... max_workers workers.
+    Returns list of (workers, drones, seconds, re-planned drones) """
+    workers_ = [1]
+    while workers_[-1] * 2 < max_workers:
+        workers_.append(workers_[-1] * 2)
+    if workers_[-1] < max_workers:
+        workers_.append(max_workers)
+
+    result_: list[tuple[int, int, float, int]] = []
+    for w_ in workers_:
+        map.reset_paths()
+        time_ = time.perf_counter()
+        if w_ > 1:
+            replanned = map.find_drones_paths_parallel(w_, batch)
+        else:
+            map.find_drones_paths()
+            replanned = 0
+        result_.append((w_, len(map.drones_path),
+                        time.perf_counter() - time_, replanned))
+    return result_
+
+
+def plot_throughput(rows: list[tuple[int, int, float, int]],
+                    title: str, file_name: str) -> None:
+    from matplotlib import pyplot as plt
+
+    fig, ax = plt.subplots()
+    ax.plot([r_[0] for r_ in rows], [r_[1] / r_[2] for r_ in rows], 'o-')
+    ax.set_xlabel("workers")
+    ax.set_ylabel("drones planned per second")
+    ax.set_title(title)
+    ax.grid(True)
+    fig.savefig(file_name)
+
+
+def sweep(map: CFlMap) -> list[tuple[int, int, int]]:
+    """ Plan map.nb_drones drones once and take makespan for every
+    fleet size. Returns list of (drones, turns, turns added by the drone) """
+    map.reset_paths()
+    map.find_drones_paths()
+    result_: list[tuple[int, int, int]] = []
+    prev_ = 0
+    for i_, turns_ in enumerate(map.makespans()):
+        result_.append((i_ + 1, turns_, turns_ - prev_))
+        prev_ = turns_
+    return result_
+
+
+def plot_sweep(rows: list[tuple[int, int, int]], title: str,
+               file_name: str) -> None:
+    from matplotlib import pyplot as plt
+
+    fig, ax = plt.subplots()
+    ax.plot([r_[0] for r_ in rows], [r_[1] for r_ in rows], '.-')
+    ax.set_xlabel("drones")
+    ax.set_ylabel("turns")
+    ax.set_title(title)
+    ax.grid(True)
+    fig.savefig(file_name)
+
+
+def compare_engines(map: CFlMap) -> list[tuple[str, int, float, float]]:
+    """ Plan all drones by every engine.
+    Returns list of (engine, turns, expansions per drone, seconds) """
+    result_: list[tuple[str, int, float, float]] = []
+    for e_ in EEngine:
+        map.reset_paths()
+        map.engine = e_
+        time_ = time.perf_counter()
+        map.find_drones_paths()
+        time_ = time.perf_counter() - time_
+        turns_ = map.makespans()
+        result_.append((e_.value, turns_[-1] if turns_ else -1,
+                        map.expansions / max(map.nb_drones, 1), time_))
+    return result_
+
+
+def main() -> None:
+    OPTIONS = ["--drones", "--max-workers", "--batch", "--simplify",
+               "--plot", "--json"]
+    args = [a_ for a_ in sys.argv[1:] if not a_.startswith("--")]
+    options: dict[str, str] = {}
+    for a_ in sys.argv[1:]:
+        if a_.startswith("--"):
+            key_, _, value_ = a_.partition("=")
+            options[key_] = value_
+
+    if (len(args) < 1) or any(o_ not in OPTIONS for o_ in options) or \
+            (args[0] not in ["throughput", "sweep", "engines"]) or \
+            ((len(args) < 2) and (args[0] != "engines")):
+        print(USAGE)
+        sys.exit(1)
+    if args[0] == "engines":
+        files_ = args[1:] if len(args) > 1 else sorted(
+            glob.glob("maps/hard/*.txt"))
+        print("map,engine,drones,turns,expansions_per_drone,seconds")
+        for f_ in files_:
+            try:
+                e_map = CFlMap(name=f_)
+                e_map.read_file(f_)
+                if int(options.get("--drones", "0")) > 0:
+                    e_map.nb_drones = int(options["--drones"])
+            except Exception as e:
+                print(e, file=sys.stderr)
+                sys.exit(1)
+            for e_, t_, x_, s_ in compare_engines(e_map):
+                print(f"{f_},{e_},{e_map.nb_drones},{t_},{x_:.1f},{s_:.4f}")
+        return
+    try:
+        drones = int(options.get("--drones", "0"))
+        max_workers = int(options.get("--max-workers", "4"))
+        batch = int(options.get("--batch", "0"))
+        m_map = CFlMap(name=args[1])
+        m_map.read_file(args[1])
+    except Exception as e:
+        print(e, file=sys.stderr)
+        print(USAGE)
+        sys.exit(1)
+    if drones > 0:
+        m_map.nb_drones = drones
+    if "--simplify" in options:
+        m_map.simplify()
+
+    if args[0] == "sweep":
+        rows_ = sweep(m_map)
+        if "--json" in options:
+            print(json.dumps({"map": m_map.name,
+                              "drones": [r_[0] for r_ in rows_],
+                              "turns": [r_[1] for r_ in rows_],
+                              "marginal": [r_[2] for r_ in rows_]}))
+        else:
+            print("drones,turns,marginal")
+            for d_, t_, m_ in rows_:
+                print(f"{d_},{t_},{m_}")
+        if options.get("--plot"):
+            plot_sweep(rows_, m_map.name, options["--plot"])
+        return
+
+    rows = throughput(m_map, max(max_workers, 1), batch)
+    print("workers,batch,drones,seconds,drones_per_sec,replanned")
+    for w_, d_, s_, r_ in rows:
+        print(f"{w_},{batch if batch > 0 else w_},{d_},{s_:.4f},"
+              f"{d_ / s_:.1f},{r_}")
+    if options.get("--plot"):
+        plot_throughput(rows, f"{m_map.name}, drones: {m_map.nb_drones}",
+                        options["--plot"])
+
+
+if __name__ == "__main__":
+    main()
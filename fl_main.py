@@ -1,5 +1,6 @@
 
 import sys
+import time
 from typing import cast, Any
 
 from matplotlib import pyplot as plt
@@ -9,7 +10,7 @@ from matplotlib.colors import is_color_like, to_rgba
 from matplotlib.animation import FuncAnimation
 # from matplotlib.backend_bases import KeyEvent
 
-from flmap import CFlMap, EZoneStatus, CArea  # CLink, CArea, ELocation
+from flmap import CFlMap, EZoneStatus, CArea, EEngine, CCorridor
 
 
 def draw_map(map: CFlMap, max_turs: int) -> None:
@@ -244,19 +245,70 @@ def draw_map(map: CFlMap, max_turs: int) -> None:
     plt.show()
 
 
-def main() -> None:
-    if len(sys.argv) < 2:
-        print("Usage: python3 ", sys.argv[0], " <config_file>")
-        sys.exit(1)
+def print_simplify_report(stats: dict[str, int], time_full: float,
+                          time_reduced: float, time_simplify: float,
+                          repeats: int) -> None:
+    """ Print how much the graph shrank and planning speed-up """
+    print(f"Hubs: {stats['hubs']} -> {stats['hubs_active']} (pruned) "
+          f"-> {stats['hubs_reduced']} (contracted)")
+    print(f"Links: {stats['links']} -> {stats['links_active']} (pruned) "
+          f"-> {stats['links_reduced']} (contracted)")
+    speed_up = time_full / time_reduced if time_reduced > 0 else 0
+    print(f"Planning (best of {repeats}): {time_full * 1000:.2f} ms -> "
+          f"{time_reduced * 1000:.2f} ms (x{speed_up:.2f}), "
+          f"simplify: {time_simplify * 1000:.2f} ms")
+
+
+def time_planning(map: CFlMap, corridors: dict[str, list[CCorridor]],
+                  workers: int, batch: int) -> tuple[float, int]:
+    """ Plan all drones on the given graph from scratch.
+    Returns (seconds, quantity of re-planned drones) """
+    map.corridors = corridors
+    map.space_hubs = []     # rebuilt from the new corridors
+    map.reset_paths()
+    time_ = time.perf_counter()
+    replanned = plan_drones(map, workers, batch)
+    return time.perf_counter() - time_, replanned
+
+
+def plan_drones(map: CFlMap, workers: int, batch: int) -> int:
+    """ Find paths for all drones, in parallel if workers > 1.
+    Returns quantity of re-planned drones """
+    if workers > 1:
+        return map.find_drones_paths_parallel(workers, batch)
+    map.find_drones_paths()
+    return 0
 
-    file_name = sys.argv[1]
 
-    if len(file_name) < 1:
-        print("Usage: python3 ", sys.argv[0], " <config_file>")
+def main() -> None:
+    OPTIONS = ["--simplify", "--workers", "--batch", "--engine"]
+    ENGINES = [e_.value for e_ in EEngine]
+    args = [a_ for a_ in sys.argv[1:] if not a_.startswith("--")]
+    options: dict[str, str] = {}
+    for a_ in sys.argv[1:]:
+        if a_.startswith("--"):
+            key_, _, value_ = a_.partition("=")
+            options[key_] = value_
+
+    try:
+        workers = int(options.get("--workers", "1"))
+        batch = int(options.get("--batch", "0"))
+    except ValueError:
+        workers = 0
+        batch = 0
+    if (len(args) < 1) or (len(args[0]) < 1) or (workers < 1) or \
+            (batch < 0) or any(o_ not in OPTIONS for o_ in options) or \
+            (options.get("--engine", EEngine.ASTAR.value) not in ENGINES):
+        print("Usage: python3 ", sys.argv[0],
+              " <config_file> [--simplify] [--workers=<n>] [--batch=<n>]"
+              f" [--engine={'|'.join(ENGINES)}]")
         sys.exit(1)
+
+    file_name = args[0]
     try:
         m_map = CFlMap(name=file_name)
         m_map.read_file(file_name)
+        m_map.engine = EEngine(options.get("--engine", EEngine.ASTAR.value))
     except Exception as e:
         print(e, file=sys.stderr)
         sys.exit(1)
@@ -269,7 +321,33 @@ def main() -> None:
     # path = find_path(config)
     # print(path)
 
-    m_map.find_drones_paths()
+    if "--simplify" in options:
+        REPEATS = 5
+        # not timed: builds the full graph and warms up
+        plan_drones(m_map, workers, batch)
+        full_ = m_map.corridors
+        time_ = time.perf_counter()
+        stats = m_map.simplify()
+        time_simplify = time.perf_counter() - time_
+        reduced_ = m_map.corridors
+        times_full: list[float] = []
+        times_reduced: list[float] = []
+        for _ in range(REPEATS):
+            t_, _ = time_planning(m_map, full_, workers, batch)
+            times_full.append(t_)
+            # the last plan (on the reduced graph) is the result
+            t_, replanned = time_planning(m_map, reduced_, workers, batch)
+            times_reduced.append(t_)
+        print_simplify_report(stats, min(times_full), min(times_reduced),
+                              time_simplify, REPEATS)
+    else:
+        replanned = plan_drones(m_map, workers, batch)
+    if workers > 1:
+        print(f"Parallel planning: {workers} workers, "
+              f"batch {batch if batch > 0 else workers}, "
+              f"{replanned} drones re-planned")
+    if ("--simplify" in options) or (workers > 1):
+        print("-"*20)
 
     if len(m_map.drones_path) <= 0:
         return
@@ -1,8 +1,10 @@
 import sys
 import re
-from typing import Any, cast
+from typing import Any, Iterator, cast
 from enum import Enum
 import heapq
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import Connection
 from pydantic import BaseModel, Field, model_validator, field_validator
 from pydantic import ConfigDict
 
@@ -15,6 +17,12 @@ class EZoneStatus(Enum):
     BLOCKED = 999999
 
 
+class EEngine(Enum):
+    """ Search used to find path for one drone """
+    ASTAR = "astar"             # A* on hubs, waiting by delay of arrival
+    SPACE_TIME = "space_time"   # A* on (hub, turn) states with waiting
+
+
 class ELocation(Enum):
     HUB = "hub"
     START_HUB = "start_hub"
@@ -87,6 +95,20 @@ class CLink(BaseModel):
     occupied: dict[int, int] = {}
 
 
+class CCorridor(BaseModel):
+    """ Super-edge - chain of hubs passed without branching.
+    hubs[0] - where the corridor starts, hubs[-1] - where it ends,
+    links[i] - connection between hubs[i] and hubs[i + 1] """
+
+    model_config = ConfigDict(frozen=True)
+
+    hubs: list[CArea]
+    links: list[CLink]
+    travel_time: int = 1    # turns to pass the corridor without waiting
+    capacity: int = 1       # bottleneck (min of links and inner hubs)
+    cost: int = 0           # sum of zone costs (priority zones are cheaper)
+
+
 class CFlMap(BaseModel):
     """ Map (Graph) """
     name: str = Field(min_length=1)
@@ -96,6 +118,18 @@ class CFlMap(BaseModel):
     hubs: dict[str, CArea] = {}
     links: list[CLink] = []
     drones_path: list[list[CArea | tuple[CArea, CArea]]] = []
+    # graph used by the planner: hub name -> corridors going out of the hub
+    corridors: dict[str, list[CCorridor]] = {}
+    # graph used by the space-time search (built from corridors):
+    # hubs, hub -> index in space_hubs, hub -> turns to the end hub
+    space_hubs: list[CArea] = []
+    space_index: dict[CArea, int] = {}
+    time_to_end: dict[CArea, int] = {}
+    # last reserved turn: on the whole map and for every hub
+    last_turn: int = 0
+    hub_last_turn: dict[CArea, int] = {}
+    engine: EEngine = EEngine.ASTAR
+    expansions: int = 0     # states expanded by the search (all drones)
     x_min: int | None = None
     x_max: int | None = None
     y_min: int | None = None
@@ -267,6 +301,217 @@ class CFlMap(BaseModel):
         if self.end_hub is None:
             raise ValueError("Finish hub (end_hub) not found!")
 
+    def _build_corridors(self, active: set[CArea] | None = None,
+                         contract: bool = False) -> None:
+        """ Build graph for the planner from hubs in 'active'
+        (all not blocked hubs by default). With 'contract' chains of
+        degree-2 hubs are collapsed into one corridor """
+        if active is None:
+            active = {h_ for h_ in self.hubs.values()
+                      if h_.zone != EZoneStatus.BLOCKED}
+
+        def neighbours(hub: CArea) -> list[tuple[CLink, CArea]]:
+            return [(l_, h_) for l_, h_, _ in hub.links if h_ in active]
+
+        def is_inner(hub: CArea) -> bool:
+            return (contract and hub != self.start_hub
+                    and hub != self.end_hub and len(neighbours(hub)) == 2)
+
+        self.corridors = {}
+        self.space_hubs = []
+        for hub in active:
+            if is_inner(hub):
+                continue
+            out_: list[CCorridor] = []
+            for link, next_ in neighbours(hub):
+                hubs_ = [hub, next_]
+                links_ = [link]
+                while is_inner(hubs_[-1]):
+                    link, next_ = [n_ for n_ in neighbours(hubs_[-1])
+                                   if n_[1] != hubs_[-2]][0]
+                    hubs_.append(next_)
+                    links_.append(link)
+                if hubs_[-1] == hub:
+                    continue    # loop, returns to the same hub
+                out_.append(CCorridor(
+                    hubs=hubs_, links=links_,
+                    travel_time=sum(2 if h_.zone == EZoneStatus.RESTRICTED
+                                    else 1 for h_ in hubs_[1:]),
+                    capacity=min([l_.max_link_capacity for l_ in links_]
+                                 + [h_.max_drones for h_ in hubs_[1:-1]]),
+                    cost=sum(h_.zone.value for h_ in hubs_[1:])))
+            self.corridors[hub.name] = out_
+
+    def simplify(self) -> dict[str, int]:
+        """ Prepare reduced graph for the planner:
+        - remove hubs and links which can't lie on any start->end path
+          (blocked, unreachable, dead-end branches - also with loops):
+          only blocks (biconnected components) on the start->end path
+          of the block-cut tree are kept
+        - collapse chains of degree-2 hubs into corridors (super-edges)
+        Hubs and links of the map are not changed (they are needed
+        for the output), only the planner graph (corridors) is reduced.
+        Returns statistic: sizes of the graph before and after """
+        start_ = cast(CArea, self.start_hub)
+        end_ = cast(CArea, self.end_hub)
+
+        # biconnected components (blocks) of the part reachable from
+        # the start (Tarjan, without recursion)
+        def neighbours(hub: CArea) -> list[CArea]:
+            return [h_ for _, h_, _ in hub.links
+                    if (h_.zone != EZoneStatus.BLOCKED) and (h_ != hub)]
+
+        disc: dict[CArea, int] = {start_: 0}
+        low: dict[CArea, int] = {start_: 0}
+        blocks: list[set[CArea]] = []
+        edges_: list[tuple[CArea, CArea]] = []
+        stack_: list[tuple[CArea, CArea | None, Iterator[CArea]]] = [
+            (start_, None, iter(neighbours(start_)))]
+        while stack_:
+            hub, parent_, next_ = stack_[-1]
+            for h_ in next_:
+                if h_ == parent_:
+                    continue
+                if h_ not in disc:
+                    disc[h_] = low[h_] = len(disc)
+                    edges_.append((hub, h_))
+                    stack_.append((h_, hub, iter(neighbours(h_))))
+                    break
+                if disc[h_] < disc[hub]:
+                    low[hub] = min(low[hub], disc[h_])
+                    edges_.append((hub, h_))
+            else:
+                stack_.pop()
+                if parent_ is None:
+                    continue
+                low[parent_] = min(low[parent_], low[hub])
+                if low[hub] >= disc[parent_]:
+                    # parent_ separates the block with hub
+                    block_: set[CArea] = set()
+                    while True:
+                        edge_ = edges_.pop()
+                        block_.update(edge_)
+                        if edge_ == (parent_, hub):
+                            break
+                    blocks.append(block_)
+
+        # only blocks on the start->end path of the block-cut tree
+        # can contain a start->end path
+        active: set[CArea] = {start_}
+        if end_ in disc:
+            hub_blocks: dict[CArea, list[int]] = {}
+            for i_, block_ in enumerate(blocks):
+                for h_ in block_:
+                    hub_blocks.setdefault(h_, []).append(i_)
+            came_from: dict[CArea, tuple[int, CArea]] = {}
+            queue_ = [start_]
+            seen_ = set()
+            while queue_ and (end_ not in came_from):
+                hub = queue_.pop(0)
+                for i_ in hub_blocks.get(hub, []):
+                    if i_ in seen_:
+                        continue
+                    seen_.add(i_)
+                    for h_ in blocks[i_]:
+                        if (h_ not in came_from) and (h_ != start_):
+                            came_from[h_] = (i_, hub)
+                            queue_.append(h_)
+            hub = end_
+            while hub != start_:
+                i_, hub = came_from[hub]
+                active.update(blocks[i_])
+        links_active = len([l_ for l_ in self.links
+                            if l_.hubs[0] in active and l_.hubs[1] in active])
+
+        self._build_corridors(active, contract=True)
+        return {"hubs": len(self.hubs),
+                "links": len(self.links),
+                "hubs_active": len(active),
+                "links_active": links_active,
+                "hubs_reduced": len(self.corridors),
+                "links_reduced": sum(len(c_) for c_
+                                     in self.corridors.values()) // 2}
+
+    def _arrival_time(self, link: CLink, hub: CArea, time_from: int) -> int:
+        """ Earliest time to arrive to 'hub' by 'link' if leave
+        the previous hub not earlier than 'time_from' """
+        tentative_g = time_from + 1
+        if (hub.zone == EZoneStatus.RESTRICTED):
+            tentative_g += 1
+        t_ = 0
+        if (hub.zone == EZoneStatus.RESTRICTED):
+            while ((link.max_link_capacity <=
+                    link.occupied.get(tentative_g + t_, 0))
+                    or (link.max_link_capacity <=
+                        link.occupied.get(tentative_g + t_ - 1, 0))
+                    or
+                    ((hub.max_drones <=
+                      hub.occupied.get(tentative_g + t_, 0))
+                     and (hub != self.end_hub))
+                   ):
+                t_ += 1
+        else:
+            while ((link.max_link_capacity <=
+                    link.occupied.get(tentative_g + t_, 0))
+                    or
+                    ((hub.max_drones <=
+                     hub.occupied.get(tentative_g + t_, 0))
+                     and (hub != self.end_hub))):
+                t_ += 1
+        return tentative_g + t_
+
+    def _path_occupation(self, path: list[CArea | tuple[CArea, CArea]]
+                         ) -> list[tuple[CArea | CLink, int]]:
+        """ What hubs and links the path occupies:
+        list of (hub or link, time) """
+        used_: list[tuple[CArea | CLink, int]] = []
+        for t_ in range(1, len(path)):
+            prev_ = path[t_ - 1]
+            cur_ = path[t_]
+            if isinstance(prev_, tuple):
+                prev_ = prev_[0]
+            if isinstance(cur_, tuple):
+                used_.append((self._link_between(*cur_), t_))
+                continue
+            used_.append((cur_, t_))
+            if prev_ != cur_:
+                used_.append((self._link_between(prev_, cur_), t_))
+        return used_
+
+    def _link_between(self, hub_1: CArea, hub_2: CArea) -> CLink:
+        return [l_ for l_, h_, _ in hub_1.links if h_ == hub_2][0]
+
+    def _reserve_path(self, path: list[CArea | tuple[CArea, CArea]]
+                      ) -> None:
+        """ Occupy hubs and links of the path """
+        for res_, t_ in self._path_occupation(path):
+            res_.occupied[t_] = res_.occupied.get(t_, 0) + 1
+            if isinstance(res_, CArea) and (
+                    t_ > self.hub_last_turn.get(res_, 0)):
+                self.hub_last_turn[res_] = t_
+        self.last_turn = max(self.last_turn, len(path) - 1)
+
+    def _release_path(self, path: list[CArea | tuple[CArea, CArea]]
+                      ) -> None:
+        """ Free hubs and links occupied by the path
+        (last reserved turns are not lowered) """
+        for res_, t_ in self._path_occupation(path):
+            res_.occupied[t_] -= 1
+            if res_.occupied[t_] < 1:
+                del res_.occupied[t_]
+
+    def _path_fits(self, path: list[CArea | tuple[CArea, CArea]]) -> bool:
+        """ Check that the path doesn't exceed capacity of hubs and links
+        occupied by already planned drones """
+        for res_, t_ in self._path_occupation(path):
+            if isinstance(res_, CLink):
+                if res_.max_link_capacity <= res_.occupied.get(t_, 0):
+                    return False
+            elif ((res_ != self.start_hub) and (res_ != self.end_hub)
+                  and res_.max_drones <= res_.occupied.get(t_, 0)):
+                return False
+        return True
+
     def find_path_for_one_drone(self,
                                 drone_number: int) -> list[CArea |
                                                            tuple[CArea,
@@ -274,41 +519,37 @@ class CFlMap(BaseModel):
         # -> list[tuple[CLink | None, CArea | None]]:
         drone_number
 
-        def reconstruct_path(came_from: dict[CArea, CArea],
-                             current: CArea,
-                             g_score: dict[CArea, int]
+        # came_from: hub -> (corridor to the hub,
+        #                    arrival time for every hub of the corridor)
+        def reconstruct_path(came_from: dict[CArea, tuple[CCorridor,
+                                                          list[int]]],
+                             current: CArea
                              ) -> list[CArea | tuple[CArea, CArea]]:
             path: list[CArea | tuple[CArea, CArea]] = [current]  # goal
-            time_ = g_score[current]   # arrival time
             while current in came_from:
-                from_ = came_from[current]
-                time_c = g_score[from_]
-                current.occupied[time_] = current.occupied.get(time_, 0) + 1
-
-                link_ = [l_ for l_ in self.links if (from_ in l_.hubs)
-                         and (current in l_.hubs)][0]
-                if current.zone == EZoneStatus.RESTRICTED:
-                    link_.occupied[time_ - 1] = link_.occupied.get(time_ - 1,
-                                                                   0) + 1
-                    time_step = 2
-                else:
-                    time_step = 1
-                link_.occupied[time_] = link_.occupied.get(time_, 0) + 1
-                if current.zone == EZoneStatus.RESTRICTED:
-                    path.append((from_, current))
-                while time_ > (time_c + time_step):
-                    from_.occupied[time_ - time_step] = from_.occupied.get(
-                        time_ - time_step, 0) + 1
+                corridor, times_ = came_from[current]
+                for i_ in range(len(corridor.hubs) - 1, 0, -1):
+                    from_ = corridor.hubs[i_ - 1]
+                    time_c = times_[i_ - 1]
+                    hub_ = corridor.hubs[i_]
+                    time_ = times_[i_]
+                    if hub_.zone == EZoneStatus.RESTRICTED:
+                        path.append((from_, hub_))
+                        time_ -= 1
+                    while time_ > (time_c + 1):
+                        path.append(from_)
+                        time_ -= 1
                     path.append(from_)
-                    time_ -= 1
-                current = from_
-                time_ = time_c
-                path.append(current)
+                current = corridor.hubs[0]
 
                 # print("=", current.name, "time:", g_score[current])
             path.reverse()
+            self._reserve_path(path)
             return path
 
+        if not self.corridors:
+            self._build_corridors()
+
         g_score: dict[CArea, int] = {cast(CArea, self.start_hub): 0}
 
         # open_heap : list[tuple[int, int, int, CArea]]
@@ -317,7 +558,7 @@ class CFlMap(BaseModel):
         heapq.heappush(open_heap,
                        cast(tuple[int, int, int, CArea],
                             (0, 0, 0, self.start_hub)))
-        came_from: dict[CArea, CArea] = {}
+        came_from: dict[CArea, tuple[CCorridor, list[int]]] = {}
         closed = set()
 
         counter = 0  # prevents tie comparison issues
@@ -326,70 +567,335 @@ class CFlMap(BaseModel):
             step_, cost_, _, current = heapq.heappop(open_heap)
 
             if current == self.end_hub:
-                return reconstruct_path(came_from, current, g_score)
+                return reconstruct_path(came_from, current)
 
             if current in closed:
                 continue
             closed.add(current)
+            self.expansions += 1
 
             score_ = g_score[current]
 
-            for l_ in current.links:
-                link, hub, max_dron_link = l_
+            for corridor in self.corridors.get(current.name, []):
+                hub = corridor.hubs[-1]
 
                 if hub in closed:
                     continue
-                if hub.zone == EZoneStatus.BLOCKED:
-                    closed.add(hub)
-                    continue
 
-                cost_hub = hub.zone.value
-                time_ = 1
-                if (hub.zone == EZoneStatus.RESTRICTED):
-                    time_ = 2
-                tentative_g = score_ + time_
-
-                if (hub not in g_score) or g_score[hub] > tentative_g:
-                    # check link
-                    link_ = [l_ for l_ in self.links if (hub in l_.hubs)
-                             and (current in l_.hubs)][0]
-                    if link_.max_link_capacity < 1:
+                tentative_g = score_ + corridor.travel_time
+
+                if (hub not in g_score) or g_score[hub] >= tentative_g:
+                    # check links and hubs of the corridor
+                    times_ = [score_]
+                    for i_ in range(1, len(corridor.hubs)):
+                        times_.append(self._arrival_time(
+                            corridor.links[i_ - 1], corridor.hubs[i_],
+                            times_[-1]))
+                    # on the same arrival time prefer less waiting,
+                    # a waiting drone keeps the hub occupied
+                    if (hub in came_from) and (
+                            (g_score[hub],
+                             -came_from[hub][0].travel_time)
+                            <= (times_[-1], -corridor.travel_time)):
                         continue
-                    t_ = 0
-                    if (hub.zone == EZoneStatus.RESTRICTED):
-                        while ((link_.max_link_capacity <=
-                                link_.occupied.get(tentative_g + t_, 0))
-                                or (link_.max_link_capacity <=
-                                    link_.occupied.get(
-                                        tentative_g + t_ - 1, 0))
-                                or
-                                ((hub.max_drones <=
-                                  hub.occupied.get(tentative_g + t_, 0))
-                                 and (hub != self.end_hub))
-                               ):
-                            t_ += 1
-                    else:
-                        while ((link_.max_link_capacity <=
-                                link_.occupied.get(tentative_g + t_, 0))
-                                or
-                                ((hub.max_drones <=
-                                 hub.occupied.get(tentative_g + t_, 0))
-                                 and (hub != self.end_hub))):
-                            t_ += 1
-                    g_score[hub] = tentative_g + t_
-                    came_from[hub] = current
+                    g_score[hub] = times_[-1]
+                    came_from[hub] = (corridor, times_)
                     counter += 1
                     # print("cur:", current.name, "---------hub:", hub.name,
-                    # "time:", tentative_g + t_,
-                    # "cost:", cost_hub, "count:", counter)
-                    heapq.heappush(open_heap, (tentative_g + t_,
-                                               cost_hub, counter, hub))
+                    # "time:", times_[-1],
+                    # "cost:", corridor.cost, "count:", counter)
+                    heapq.heappush(open_heap, (times_[-1],
+                                               corridor.cost, counter, hub))
         return []
 
+    def _build_space_time(self) -> None:
+        """ Build graph for the space-time search from hubs of the planner
+        graph (corridors): all not blocked hubs or only hubs kept by
+        simplify() """
+        if not self.corridors:
+            self._build_corridors()
+        names_ = set(self.corridors)
+        for corridors_ in self.corridors.values():
+            for c_ in corridors_:
+                names_.update(h_.name for h_ in c_.hubs)
+        self.space_hubs = [h_ for h_ in self.hubs.values()
+                           if h_.name in names_]
+        self.space_index = {h_: i_ for i_, h_ in enumerate(self.space_hubs)}
+        self.time_to_end = self._time_to_end(self.space_hubs)
+
+    def _time_to_end(self, hubs: list[CArea]) -> dict[CArea, int]:
+        """ Turns from every hub of 'hubs' to the end hub
+        on the empty map """
+        allowed_ = set(hubs)
+        end_ = cast(CArea, self.end_hub)
+        time_: dict[CArea, int] = {end_: 0}
+        heap_: list[tuple[int, str]] = [(0, end_.name)]
+        while heap_:
+            t_, name_ = heapq.heappop(heap_)
+            hub = self.hubs[name_]
+            if t_ > time_[hub]:
+                continue
+            step_ = 2 if hub.zone == EZoneStatus.RESTRICTED else 1
+            for _, h_, _ in hub.links:
+                if h_ not in allowed_:
+                    continue
+                if (h_ not in time_) or (time_[h_] > t_ + step_):
+                    time_[h_] = t_ + step_
+                    heapq.heappush(heap_, (t_ + step_, h_.name))
+        return time_
+
+    def find_path_space_time(self,
+                             drone_number: int) -> list[CArea |
+                                                        tuple[CArea,
+                                                              CArea]]:
+        """ A* on (hub, turn) states. Drone can wait in a hub while the
+        hub is not full, reservations of hubs and links are checked for
+        every turn. Arrival to a hub is not expanded if the drone could
+        be there earlier and wait (dominance). State = turn * hubs + hub.
+        Only hubs of the planner graph are used (see simplify()) """
+        drone_number
+        if not self.space_hubs:
+            self._build_space_time()
+        hubs_ = self.space_hubs
+        n_ = len(hubs_)
+        index_ = self.space_index
+        start_ = cast(CArea, self.start_hub)
+        end_ = cast(CArea, self.end_hub)
+        to_end = self.time_to_end
+        if start_ not in to_end:
+            return []
+        # after the last reservation the drone flies without waiting
+        last_ = self.hub_last_turn
+        horizon = self.last_turn + to_end[start_] + 1
+
+        def wait_until(hub: CArea, time_: int) -> int:
+            """ Last turn the drone can stay in the hub from 'time_' """
+            if (hub == start_) or (hub == end_):
+                return horizon
+            last_time = last_.get(hub, 0)
+            while ((time_ < last_time) and (hub.max_drones >
+                                            hub.occupied.get(time_ + 1, 0))):
+                time_ += 1
+            return horizon if time_ >= last_time else time_
+
+        def can_move(link: CLink, hub: CArea, time_: int) -> bool:
+            """ Can the drone arrive to 'hub' by 'link' at 'time_' """
+            if link.max_link_capacity <= link.occupied.get(time_, 0):
+                return False
+            if (hub.zone == EZoneStatus.RESTRICTED) and (
+                    link.max_link_capacity <= link.occupied.get(time_ - 1,
+                                                                0)):
+                return False
+            return (hub == end_) or (hub.max_drones >
+                                     hub.occupied.get(time_, 0))
+
+        # open_heap: (turn + time to end, waiting turns, cost/prioritet,
+        #             counter, state)
+        # less waiting is better - a waiting drone keeps the hub occupied
+        open_heap: list[tuple[int, int, int, int, int]] = [
+            (to_end[start_], 0, 0, 0, index_[start_])]
+        came_from: dict[int, int] = {}
+        covered_ = [-1] * n_    # hub is reached and can wait until turn
+        counter = 0
+
+        while open_heap:
+            _, waits_, cost_, _, state_ = heapq.heappop(open_heap)
+            time_, i_ = divmod(state_, n_)
+            current = hubs_[i_]
+
+            if current == end_:
+                return self._space_time_path(came_from, state_, hubs_)
+            if time_ <= covered_[i_]:
+                continue
+            covered_[i_] = wait_until(current, time_)
+            self.expansions += 1
+
+            for link, hub, _ in current.links:
+                if hub not in to_end:
+                    continue
+                j_ = index_[hub]
+                step_ = 2 if hub.zone == EZoneStatus.RESTRICTED else 1
+                reached_ = covered_[j_]
+                # leave now or after waiting
+                leave_ = time_
+                while ((leave_ <= covered_[i_])
+                       and (leave_ + step_ <= horizon)):
+                    arrive_ = leave_ + step_
+                    if arrive_ <= reached_:
+                        # arrive earlier and wait there
+                        leave_ = reached_ - step_ + 1
+                        continue
+                    leave_ += 1
+                    if not can_move(link, hub, arrive_):
+                        continue
+                    next_ = arrive_ * n_ + j_
+                    if next_ not in came_from:
+                        came_from[next_] = state_
+                        counter += 1
+                        heapq.heappush(open_heap,
+                                       (arrive_ + to_end[hub],
+                                        waits_ + arrive_ - step_ - time_,
+                                        cost_ + hub.zone.value,
+                                        counter, next_))
+                    reached_ = wait_until(hub, arrive_)
+        return []
+
+    def _space_time_path(self, came_from: dict[int, int], state: int,
+                         hubs: list[CArea]
+                         ) -> list[CArea | tuple[CArea, CArea]]:
+        """ Path from states of find_path_space_time() """
+        n_ = len(hubs)
+        time_, i_ = divmod(state, n_)
+        path: list[CArea | tuple[CArea, CArea]] = [hubs[i_]]
+        while state in came_from:
+            state = came_from[state]
+            prev_time, j_ = divmod(state, n_)
+            if hubs[i_].zone == EZoneStatus.RESTRICTED:
+                path.append((hubs[j_], hubs[i_]))
+                time_ -= 1
+            while time_ > prev_time + 1:
+                path.append(hubs[j_])
+                time_ -= 1
+            path.append(hubs[j_])
+            time_, i_ = prev_time, j_
+        path.reverse()
+        self._reserve_path(path)
+        return path
+
+    def find_path(self, drone_number: int) -> list[CArea |
+                                                   tuple[CArea, CArea]]:
+        """ Find path for one drone by the selected engine """
+        if self.engine == EEngine.SPACE_TIME:
+            return self.find_path_space_time(drone_number)
+        return self.find_path_for_one_drone(drone_number)
+
+    def reset_paths(self) -> None:
+        """ Forget found paths and free all hubs and links """
+        self.drones_path = []
+        self.expansions = 0
+        self.last_turn = 0
+        self.hub_last_turn = {}
+        for h_ in self.hubs.values():
+            h_.occupied.clear()
+        for l_ in self.links:
+            l_.occupied.clear()
+
     def find_drones_paths(self) -> None:
         for d_ in range(1, self.nb_drones + 1):
-            path_ = self.find_path_for_one_drone(d_)
+            path_ = self.find_path(d_)
             self.drones_path.append(path_)
             if len(path_) < 1:
                 print("Can't find path from start to finish!")
                 return
+
+    def makespans(self) -> list[int]:
+        """ Turns needed for the first 1, 2 ... N drones of found paths.
+        Drones are planned one by one, so paths of the first k drones
+        are the same as if only k drones were on the map """
+        result_: list[int] = []
+        turns_ = 0
+        for path_ in self.drones_path:
+            if len(path_) < 1:
+                break
+            turns_ = max(turns_, len(path_) - 1)
+            result_.append(turns_)
+        return result_
+
+    def find_drones_paths_parallel(self, workers: int,
+                                   batch_size: int = 0) -> int:
+        """ Plan drones by batches in 'workers' processes.
+        Drones of a batch are split between workers, every worker plans
+        its drones one by one on the map with all committed paths.
+        Paths are committed in drone order, drones whose path conflicts
+        with the paths committed before it are sent to the workers again
+        (next round) on the refreshed map. The first drone of a round is
+        planned on the current map, so every round commits at least it.
+        Returns quantity of re-planned drones """
+        if not self.corridors:
+            self._build_corridors()
+        if batch_size < 1:
+            batch_size = workers
+        replanned = 0
+        paths_: dict[int, list[CArea | tuple[CArea, CArea]]] = {}
+        # committed paths, a worker gets only the new ones
+        committed_: list[list[str | tuple[str, str]]] = []
+        synced_ = [0] * workers
+        pipes_: list[Connection] = []
+        processes_: list[Process] = []
+        for _ in range(workers):
+            conn_, child_ = Pipe()
+            process_ = Process(target=_planner_process, args=(child_, self),
+                               daemon=True)
+            process_.start()
+            child_.close()
+            pipes_.append(conn_)
+            processes_.append(process_)
+        try:
+            for first_ in range(1, self.nb_drones + 1, batch_size):
+                pending_ = list(range(first_, min(first_ + batch_size,
+                                                  self.nb_drones + 1)))
+                while pending_:
+                    size_ = -(-len(pending_) // workers)
+                    chunks_ = [pending_[i_:i_ + size_]
+                               for i_ in range(0, len(pending_), size_)]
+                    for w_, chunk_ in enumerate(chunks_):
+                        pipes_[w_].send((committed_[synced_[w_]:], chunk_))
+                        synced_[w_] = len(committed_)
+                    found_: dict[int, list[str | tuple[str, str]]] = {}
+                    for w_, chunk_ in enumerate(chunks_):
+                        found_.update(zip(chunk_, pipes_[w_].recv()))
+                    conflicts_: list[int] = []
+                    for d_ in pending_:
+                        path_ = self._path_by_names(found_[d_])
+                        if (len(path_) > 0) and self._path_fits(path_):
+                            self._reserve_path(path_)
+                            committed_.append(found_[d_])
+                            paths_[d_] = path_
+                        elif d_ == pending_[0]:
+                            # planned on the current map - no path at all
+                            self.drones_path = [paths_[i_] for i_
+                                                in range(1, d_)] + [[]]
+                            print("Can't find path from start to finish!")
+                            return replanned
+                        else:
+                            conflicts_.append(d_)
+                    replanned += len(conflicts_)
+                    pending_ = conflicts_
+        finally:
+            for conn_ in pipes_:
+                conn_.send(None)
+                conn_.close()
+            for process_ in processes_:
+                process_.join()
+        self.drones_path = [paths_[d_] for d_ in range(1, self.nb_drones + 1)]
+        return replanned
+
+    def _path_by_names(self, names: list[str | tuple[str, str]]
+                       ) -> list[CArea | tuple[CArea, CArea]]:
+        return [(self.hubs[n_[0]], self.hubs[n_[1]]) if isinstance(n_, tuple)
+                else self.hubs[n_] for n_ in names]
+
+
+def _path_names(path: list[CArea | tuple[CArea, CArea]]
+                ) -> list[str | tuple[str, str]]:
+    return [(p_[0].name, p_[1].name) if isinstance(p_, tuple) else p_.name
+            for p_ in path]
+
+
+def _planner_process(conn: Connection, fl_map: CFlMap) -> None:
+    """ Worker of find_drones_paths_parallel(). Keeps own copy of the map:
+    gets new committed paths and drones to plan, plans the drones one by
+    one (a drone takes into account the drones before it) and sends
+    the paths back as names of hubs """
+    while True:
+        task_ = conn.recv()
+        if task_ is None:
+            break
+        committed_, drones_ = task_
+        for names_ in committed_:
+            fl_map._reserve_path(fl_map._path_by_names(names_))
+        paths_ = [fl_map.find_path(d_) for d_ in drones_]
+        for path_ in paths_:
+            fl_map._release_path(path_)
+        conn.send([_path_names(p_) for p_ in paths_])
+    conn.close()
@@ -2,6 +2,8 @@ __version__ = "1.0.0"
 
 __author__ = "Oleksandr Bachurin"
 
-__all__ = ["CFlMap", "CLink", "CArea", "ELocation", "EZoneStatus"]
+__all__ = ["CFlMap", "CLink", "CArea", "ELocation", "EZoneStatus",
+           "CCorridor", "EEngine"]
 
 from .CFlMap import CFlMap, CLink, CArea, ELocation, EZoneStatus
+from .CFlMap import CCorridor, EEngine